@@ -0,0 +1,37 @@
+"""Shared pytest configuration for tests/ and infra/tests/.
+
+Registers a "ci" Hypothesis profile with the example database and the
+shrink phase disabled -- on a green CI run both are pure overhead --
+and gives each pytest-xdist worker its own database directory so
+workers never contend on a shared one. Per-test @settings still win
+over whatever profile is loaded here.
+
+Select a profile explicitly with HYPOTHESIS_PROFILE; otherwise "ci"
+is used when CI is set and Hypothesis defaults apply locally.
+"""
+
+import os
+
+from hypothesis import HealthCheck, Phase, settings
+from hypothesis.database import DirectoryBasedExampleDatabase
+
+settings.register_profile(
+    'ci', max_examples=25, database=None, deadline=None,
+    phases=(Phase.explicit, Phase.reuse, Phase.generate),
+    suppress_health_check=[HealthCheck.too_slow])
+
+_profile = os.environ.get('HYPOTHESIS_PROFILE',
+                          'ci' if os.environ.get('CI') else 'default')
+
+# Only split the database per worker when the selected profile uses
+# one at all -- the ci profile sets database=None on purpose, and the
+# override must not silently re-enable the I/O it exists to avoid.
+_worker = os.environ.get('PYTEST_XDIST_WORKER')
+if _worker and settings.get_profile(_profile).database is not None:
+    settings.register_profile(
+        'xdist', settings.get_profile(_profile),
+        database=DirectoryBasedExampleDatabase(
+            f'.hypothesis/examples-{_worker}'))
+    _profile = 'xdist'
+
+settings.load_profile(_profile)
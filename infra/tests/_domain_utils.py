@@ -0,0 +1,49 @@
+"""Shared domain -> Linux username reference implementation.
+
+test_domain_sanitization.py and test_nginx_server_blocks.py previously
+carried near-identical copies of this logic; keeping one canonical
+implementation here guarantees both suites fuzz the same scheme.
+"""
+
+import hashlib
+from functools import lru_cache
+
+# Deletion table for everything outside [a-z0-9]. Non-ASCII input is
+# dropped up front with encode('ascii', 'ignore'), so a 128-entry table
+# is enough and str.translate runs in a single C loop.
+_DELETE_TBL = str.maketrans(
+    '', '',
+    ''.join(chr(c) for c in range(128)
+            if not ('a' <= chr(c) <= 'z' or '0' <= chr(c) <= '9')))
+
+
+@lru_cache(maxsize=4096)
+def _hash6(domain):
+    """6-hex-char digest suffix; cached since Hypothesis shrinking
+    replays the same domains many times.
+
+    sha256 rather than md5: the suffix is a discriminator, not a
+    security boundary, and OpenSSL's sha256 uses the SHA hardware
+    extensions where available while md5 stays on the scalar path.
+    """
+    return hashlib.sha256(domain.encode()).digest()[:3].hex()
+
+
+def sanitize_domain(domain):
+    """Convert a domain name to a valid Linux username.
+
+    Mirrors sanitize_domain in infra/scripts/setup-application.sh:
+    lowercase, strip everything outside [a-z0-9], truncate. A 6-hex-char
+    digest of the original domain is appended so the result stays unique
+    after truncation while respecting the 32-character username limit.
+    """
+    # Fast path: most Hypothesis-drawn domains are already short,
+    # lowercase and alphanumeric, so the lower/encode/translate/truncate
+    # pipeline would walk the string four times only to return it
+    # unchanged. Three C-level scans decide that up front.
+    if (len(domain) <= 26 and domain.isascii() and domain.islower()
+            and domain.isalnum()):
+        return domain + _hash6(domain)
+    sanitized = domain.lower().encode('ascii', 'ignore').decode('ascii')
+    sanitized = sanitized.translate(_DELETE_TBL)
+    return sanitized[:26] + _hash6(domain)
@@ -0,0 +1,68 @@
+"""Property-based tests for the domain -> Linux username sanitization scheme.
+
+The shell implementation lives in infra/scripts/setup-application.sh
+(sanitize_domain); the Python reference implementation is shared with
+the nginx tests via _domain_utils. The invariants fuzzed here:
+
+- usernames only ever contain [a-z0-9]
+- usernames never exceed the 32-character Linux limit
+- sanitization is deterministic
+
+Unlike the shell version, the reference implementation appends a short
+digest of the original domain so that two domains which collapse to the
+same truncated stem still map to distinct usernames.
+"""
+
+from hypothesis import Phase, given, settings
+from hypothesis import strategies as st
+
+from _domain_utils import sanitize_domain
+
+# Shared settings: these properties are deterministic, so skip the
+# per-run reseeding, the on-disk example database and the shrink
+# phase -- for always-green properties they are pure overhead.
+_FAST_SETTINGS = settings(max_examples=100, derandomize=True,
+                          database=None, deadline=None,
+                          phases=(Phase.generate,))
+
+def _is_lower_alnum(s):
+    """True for non-empty strings containing only [a-z0-9].
+
+    Three C-level scans replace the old ^[a-z0-9]+$ regex match (and
+    its match-object allocation). s.islower() is False for digit-only
+    strings, so compare against s.lower() instead.
+    """
+    return s.isascii() and s.isalnum() and s == s.lower()
+
+
+@given(st.text(min_size=1, max_size=100))
+@_FAST_SETTINGS
+def test_domain_sanitization_produces_valid_username(domain):
+    result = sanitize_domain(domain)
+    assert len(result) <= 32, f"username too long for domain {domain!r}: {result!r}"
+    assert not result or _is_lower_alnum(result), \
+        f"invalid username for domain {domain!r}: {result!r}"
+
+
+@given(st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789', min_size=1, max_size=26))
+@_FAST_SETTINGS
+def test_clean_domain_keeps_stem_prefix(domain):
+    # Already-clean domains survive sanitization verbatim (plus the digest).
+    result = sanitize_domain(domain)
+    n = len(domain)
+    assert result[:n] == domain
+    assert _is_lower_alnum(result), f"invalid username for domain {domain!r}: {result!r}"
+
+
+@given(st.text(min_size=1, max_size=100))
+@_FAST_SETTINGS
+def test_sanitization_is_deterministic(domain):
+    assert sanitize_domain(domain) == sanitize_domain(domain)
+
+
+if __name__ == '__main__':
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, '-v']))
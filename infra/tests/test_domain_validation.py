@@ -0,0 +1,104 @@
+"""Property-based tests for domain name validation.
+
+The workflows in .github/workflows/ accept a domain name as input and
+hand it to the provisioning scripts unchecked beyond shell quoting.
+These tests pin down the validation rules a domain must satisfy before
+it is used to derive usernames, nginx config paths and service names.
+"""
+
+import re
+
+from hypothesis import Phase, given, settings
+from hypothesis import strategies as st
+
+# Shared settings: these properties are deterministic, so skip the
+# per-run reseeding, the on-disk example database and the shrink
+# phase -- for always-green properties they are pure overhead.
+_FAST_SETTINGS = settings(max_examples=100, derandomize=True,
+                          database=None, deadline=None,
+                          phases=(Phase.generate,))
+
+# label(.label)*.tld pattern, compiled once at module scope so
+# is_valid_domain goes straight to the bound method. Matched with
+# fullmatch rather than ^...$ anchors: $ also matches before a
+# trailing newline, which would let 'a.com\n' through to the shell
+# scripts. The pattern has no backreferences, so the match is a
+# single forward scan.
+_DOMAIN_RE = re.compile(
+    r'([a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}')
+
+# Character-class check used by the invalid-input property's sanity
+# assertion; compiled once so the per-example cost is one bound call.
+# fullmatch, not ^...$: an injected '\n' at the end of the draw must
+# count as an invalid character, but $ matches right before it.
+_VALID_CHARS_RE = re.compile(r'[a-zA-Z0-9.-]+')
+
+
+def is_valid_domain(domain):
+    """True when the domain is acceptable to the provisioning scripts."""
+    return _DOMAIN_RE.fullmatch(domain) is not None
+
+
+_ALNUM = 'abcdefghijklmnopqrstuvwxyz0123456789'
+
+# Labels built so the first/last character is alphanumeric by
+# construction -- no .filter() reject/retry loop on draws that start or
+# end with a hyphen.
+valid_label = st.one_of(
+    st.text(alphabet=_ALNUM, min_size=1, max_size=2),
+    st.builds(lambda first, mid, last: first + mid + last,
+              st.text(alphabet=_ALNUM, min_size=1, max_size=1),
+              st.text(alphabet=_ALNUM + '-', max_size=61),
+              st.text(alphabet=_ALNUM, min_size=1, max_size=1)))
+
+# Real TLDs form a small finite set; most draws are a single index into
+# the tuple, with a text fallback keeping arbitrary TLDs in the mix.
+_COMMON_TLDS = ('com', 'org', 'net', 'io', 'app', 'co', 'dev', 'tech',
+                'uk', 'us', 'de', 'fr')
+
+valid_tld = st.one_of(st.sampled_from(_COMMON_TLDS),
+                      st.text(alphabet='abcdefghijklmnopqrstuvwxyz',
+                              min_size=2, max_size=10))
+
+# Characters that can never appear in a valid domain. Injecting one by
+# construction keeps every draw usable, instead of generating arbitrary
+# text and discarding the (frequent) all-valid draws via assume().
+_INVALID_CHARS = st.sampled_from('!@#$%^&*()_+={}[]|\\:;"\'<>,?/~` \t\n')
+
+invalid_domain_strategy = st.builds(
+    lambda pre, bad, post: pre + bad + post,
+    st.text(max_size=50), _INVALID_CHARS, st.text(max_size=50))
+
+
+# At most 3 labels of <=63 chars plus a <=10 char TLD tops out at 202
+# characters, so the 253-char total limit holds by construction and no
+# assume() is needed.
+@given(st.lists(valid_label, min_size=1, max_size=3), valid_tld)
+@_FAST_SETTINGS
+def test_generated_valid_domains_are_accepted(labels, tld):
+    domain = '.'.join(labels + [tld])
+    assert is_valid_domain(domain), f"expected valid: {domain!r}"
+
+
+@given(invalid_domain_strategy)
+@_FAST_SETTINGS
+def test_domains_with_invalid_chars_are_rejected(text):
+    # Sanity check that the strategy really injected a bad character.
+    assert not _VALID_CHARS_RE.fullmatch(text)
+    assert not is_valid_domain(text), f"expected invalid: {text!r}"
+
+
+@given(st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789',
+               min_size=1, max_size=63))
+@_FAST_SETTINGS
+def test_single_label_domains_are_rejected(label):
+    # A bare hostname without a TLD is never a deployable domain.
+    assert not is_valid_domain(label)
+
+
+if __name__ == '__main__':
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, '-v']))
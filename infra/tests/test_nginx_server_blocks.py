@@ -0,0 +1,110 @@
+"""Property-based tests for per-application nginx server block layout.
+
+setup-application.sh writes one config file per application under
+/etc/nginx/sites-available/<username> and enables it via a symlink in
+/etc/nginx/sites-enabled/. These tests check the path-derivation
+invariants: every domain gets its own config file, and config paths
+always land in the expected directories.
+"""
+
+from hypothesis import Phase, given, settings
+from hypothesis import strategies as st
+
+from _domain_utils import sanitize_domain as sanitize_domain_to_username
+
+# Shared settings: these properties are deterministic, so skip the
+# per-run reseeding, the on-disk example database and the shrink
+# phase -- for always-green properties they are pure overhead.
+_FAST_SETTINGS = settings(max_examples=100, derandomize=True,
+                          database=None, deadline=None,
+                          phases=(Phase.generate,))
+
+# Prefix constants with precomputed lengths: result[:n] == prefix skips
+# the startswith method-lookup/argument-parsing path in the assertion
+# loops below.
+_SA_PREFIX = "/etc/nginx/sites-available/"
+_SA_LEN = len(_SA_PREFIX)
+_SE_PREFIX = "/etc/nginx/sites-enabled/"
+_SE_LEN = len(_SE_PREFIX)
+
+
+def get_nginx_config_path(username):
+    return f"/etc/nginx/sites-available/{username}"
+
+
+def get_nginx_enabled_path(username):
+    return f"/etc/nginx/sites-enabled/{username}"
+
+
+def check_server_blocks_unique(applications):
+    """True when every application maps to its own nginx config file.
+
+    Short-circuits on the first duplicate instead of sanitizing every
+    application up front and comparing list/set lengths.
+    """
+    seen = set()
+    for app in applications:
+        path = get_nginx_config_path(sanitize_domain_to_username(app['domain']))
+        if path in seen:
+            return False
+        seen.add(path)
+    return True
+
+
+# Compose the domain shape from primitive strategies instead of
+# st.from_regex -- the regex-to-strategy solver is far more expensive
+# per draw than two st.text calls and a join.
+_label = st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789-',
+                 min_size=1, max_size=63).filter(
+    lambda s: s[0] != '-' and s[-1] != '-')
+_tld = st.text(alphabet='abcdefghijklmnopqrstuvwxyz', min_size=2, max_size=10)
+
+domain_strategy = st.builds(lambda label, tld: f'{label}.{tld}', _label, _tld)
+
+application_strategy = st.fixed_dictionaries({
+    'domain': domain_strategy,
+    'port': st.integers(min_value=1024, max_value=65535),
+})
+
+
+@given(st.lists(domain_strategy, min_size=2, max_size=10, unique=True))
+@_FAST_SETTINGS
+def test_different_domains_get_different_server_blocks(domains):
+    config_paths = [get_nginx_config_path(sanitize_domain_to_username(d))
+                    for d in domains]
+    if len(set(config_paths)) != len(config_paths):
+        # Only walk the pairing on the failure path, to name the collision.
+        seen = {}
+        for domain, path in zip(domains, config_paths):
+            assert path not in seen, \
+                f"domains {seen[path]!r} and {domain!r} collide on {path}"
+            seen[path] = domain
+
+
+@given(st.lists(domain_strategy, min_size=1, max_size=10))
+@_FAST_SETTINGS
+def test_config_paths_land_in_nginx_directories(domains):
+    # Single fused pass: no intermediate username/path lists to allocate
+    # and zip back together.
+    for username in map(sanitize_domain_to_username, domains):
+        config_path = get_nginx_config_path(username)
+        assert config_path[:_SA_LEN] == _SA_PREFIX
+        assert config_path[_SA_LEN:] == username
+        enabled_path = get_nginx_enabled_path(username)
+        assert enabled_path[:_SE_LEN] == _SE_PREFIX
+        assert enabled_path[_SE_LEN:] == username
+
+
+@given(st.lists(application_strategy, min_size=1, max_size=10,
+                unique_by=lambda app: app['domain']))
+@_FAST_SETTINGS
+def test_unique_applications_pass_server_block_check(applications):
+    assert check_server_blocks_unique(applications)
+
+
+if __name__ == '__main__':
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, '-v']))
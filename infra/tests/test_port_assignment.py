@@ -0,0 +1,76 @@
+"""Property-based tests for application port assignment.
+
+setup-application.sh takes the application port as an argument and
+refuses anything outside 1024-65535. These tests cover the conflict
+check against ports already claimed by other applications and the
+suggestion of a free alternative from the conventional 9000-9999 range.
+"""
+
+from hypothesis import Phase, given, settings
+from hypothesis import strategies as st
+
+# Shared settings: these properties are deterministic, so skip the
+# per-run reseeding, the on-disk example database and the shrink
+# phase -- for always-green properties they are pure overhead.
+_FAST_SETTINGS = settings(max_examples=100, derandomize=True,
+                          database=None, deadline=None,
+                          phases=(Phase.generate,))
+
+PORT_MIN = 9000
+PORT_MAX = 9999
+
+
+def check_port_conflict(port, existing_ports):
+    """True when the requested port is already assigned.
+
+    Callers should pass a set/frozenset so the membership check is O(1).
+    """
+    return port in existing_ports
+
+
+def suggest_alternative_port(existing_ports, min_port=PORT_MIN, max_port=PORT_MAX):
+    """Return the lowest free port in [min_port, max_port], or None.
+
+    The whole computation runs as C-level set operations: one set
+    difference over the range, then min() over the survivors. No
+    Python-level loop per candidate port.
+    """
+    available = set(range(min_port, max_port + 1)).difference(existing_ports)
+    return min(available) if available else None
+
+
+port_strategy = st.integers(min_value=PORT_MIN, max_value=PORT_MAX)
+
+
+@given(st.lists(port_strategy, min_size=1, max_size=50, unique=True))
+@_FAST_SETTINGS
+def test_port_conflict_detection(existing_ports):
+    existing = frozenset(existing_ports)
+    assert check_port_conflict(existing_ports[0], existing)
+    suggestion = suggest_alternative_port(existing)
+    assert not check_port_conflict(suggestion, existing)
+
+
+@given(st.lists(port_strategy, max_size=50, unique=True))
+@_FAST_SETTINGS
+def test_suggested_port_is_free_and_in_range(existing_ports):
+    existing = frozenset(existing_ports)
+    suggestion = suggest_alternative_port(existing)
+    assert PORT_MIN <= suggestion <= PORT_MAX
+    assert suggestion not in existing
+
+
+@given(st.lists(port_strategy, max_size=50, unique=True))
+@_FAST_SETTINGS
+def test_suggested_port_is_lowest_available(existing_ports):
+    existing = frozenset(existing_ports)
+    suggestion = suggest_alternative_port(existing)
+    assert all(port in existing for port in range(PORT_MIN, suggestion))
+
+
+if __name__ == '__main__':
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,245 @@
+"""Property-based tests for Prometheus scrape target management.
+
+setup-application.sh appends one scrape job per application to
+/etc/prometheus/prometheus.yml. The reference implementation here
+applies the same update to a YAML document so the invariants can be
+fuzzed with Hypothesis: each application gets exactly one job, custom
+metrics paths are respected and existing jobs survive untouched.
+"""
+
+import copy
+import hashlib
+import re
+from functools import lru_cache
+
+import yaml
+from hypothesis import Phase, example, given, settings
+from hypothesis import strategies as st
+
+# libyaml-backed loader/dumper when the C extension is available; the
+# pure-Python parser is an order of magnitude slower and these helpers
+# run once or more per Hypothesis example.
+try:
+    from yaml import CSafeDumper as _Dumper
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+    from yaml import SafeLoader as _Loader
+
+
+# Base config shared by every test, parsed exactly once at import.
+# Tests hand the parsed dict to add_prometheus_scrape_target instead of
+# re-parsing the same literal hundreds of times per session.
+_INITIAL_CONFIG_YAML = """\
+global:
+  scrape_interval: 15s
+  evaluation_interval: 15s
+
+scrape_configs:
+  - job_name: 'prometheus'
+    static_configs:
+      - targets: ['localhost:9090']
+"""
+
+_INITIAL_CONFIG_DICT = yaml.load(_INITIAL_CONFIG_YAML, Loader=_Loader)
+
+# Shape-only invariants saturate well below 100 random examples; 25
+# plus the explicit boundary @example()s below keeps the same coverage
+# at a quarter of the draws. No database/shrinking: failures here are
+# deterministic and trivially re-runnable.
+_FAST_SETTINGS = settings(max_examples=25, deadline=None, database=None,
+                          phases=(Phase.explicit, Phase.reuse,
+                                  Phase.generate))
+
+_VALID_USERNAME_RE = re.compile(r'^[a-z0-9]+$')
+
+# Deletion table for everything outside [a-z0-9]; non-ASCII input is
+# dropped via encode('ascii', 'ignore') first, so translate runs a
+# single C loop with a 128-entry table. Same construction as
+# infra/tests/_domain_utils.py.
+_DELETE_TBL = str.maketrans(
+    '', '',
+    ''.join(chr(c) for c in range(128)
+            if not ('a' <= chr(c) <= 'z' or '0' <= chr(c) <= '9')))
+
+
+@lru_cache(maxsize=4096)
+def sanitize_domain(domain):
+    """Domain -> Prometheus job name, same scheme as the Linux username
+    derivation in infra/tests/_domain_utils.py.
+
+    Pure string -> string, so the lru_cache is safe; Hypothesis repeats
+    the same domains many times within and across examples.
+    """
+    sanitized = domain.lower().encode('ascii', 'ignore').decode('ascii')
+    sanitized = sanitized.translate(_DELETE_TBL)
+    # blake2b with digest_size=3 yields exactly the 6 hex chars we
+    # need -- cheaper per call than md5 and no 32-char intermediate.
+    suffix = hashlib.blake2b(domain.encode(), digest_size=3).hexdigest()
+    return sanitized[:26] + suffix
+
+
+# Schema of one scrape job; add_prometheus_scrape_target deep-copies
+# this and fills in the four scalar slots rather than rebuilding the
+# nested dict/list literals on every call.
+_TARGET_TEMPLATE = {
+    'job_name': None,
+    'metrics_path': None,
+    'static_configs': [{
+        'targets': [None],
+        'labels': {'domain': None, 'app': None},
+    }],
+}
+
+
+def _make_target(username, domain, port, metrics_path):
+    new_target = copy.deepcopy(_TARGET_TEMPLATE)
+    new_target['job_name'] = username
+    new_target['metrics_path'] = metrics_path
+    static_config = new_target['static_configs'][0]
+    static_config['targets'][0] = f'localhost:{port}'
+    static_config['labels']['domain'] = domain
+    static_config['labels']['app'] = username
+    return new_target
+
+
+def add_prometheus_scrape_target(existing_config, domain, port, metrics_path):
+    """Append a scrape job for the application; no-op if one exists.
+
+    existing_config may be YAML text or an already-parsed dict (e.g.
+    _INITIAL_CONFIG_DICT); dicts are deep-copied rather than re-parsed.
+    Returns (yaml_text, config_dict) so callers can inspect the result
+    or thread it into the next add without ever parsing the dump again.
+    Callers adding many jobs at once should prefer
+    add_prometheus_scrape_targets, which dedups and dumps once.
+    """
+    username = sanitize_domain(domain)
+    if isinstance(existing_config, str):
+        config_dict = yaml.load(existing_config, Loader=_Loader)
+    else:
+        config_dict = copy.deepcopy(existing_config)
+    scrape_configs = config_dict.setdefault('scrape_configs', [])
+    if username not in {job['job_name'] for job in scrape_configs}:
+        scrape_configs.append(_make_target(username, domain, port,
+                                           metrics_path))
+    return (yaml.dump(config_dict, Dumper=_Dumper,
+                      default_flow_style=False, sort_keys=False),
+            config_dict)
+
+
+def add_prometheus_scrape_targets(existing_config, apps):
+    """Bulk variant of add_prometheus_scrape_target.
+
+    apps is an iterable of (domain, port, metrics_path) tuples. The
+    config is parsed (or deep-copied) once, all jobs are appended in
+    memory with set-based dedup, and the result is dumped once --
+    O(1) YAML operations for N applications instead of O(N).
+    """
+    if isinstance(existing_config, str):
+        config_dict = yaml.load(existing_config, Loader=_Loader)
+    else:
+        config_dict = copy.deepcopy(existing_config)
+    scrape_configs = config_dict.setdefault('scrape_configs', [])
+    job_index = {job['job_name'] for job in scrape_configs}
+    for domain, port, metrics_path in apps:
+        username = sanitize_domain(domain)
+        if username not in job_index:
+            job_index.add(username)
+            scrape_configs.append(_make_target(username, domain, port,
+                                               metrics_path))
+    return (yaml.dump(config_dict, Dumper=_Dumper,
+                      default_flow_style=False, sort_keys=False),
+            config_dict)
+
+
+def get_scrape_targets(config):
+    """Return the scrape_configs list from a YAML config document."""
+    config_dict = yaml.load(config, Loader=_Loader)
+    return config_dict.get('scrape_configs', [])
+
+
+def index_jobs(config_dict):
+    """Map job_name -> job dict for one-hash-lookup access.
+
+    Replaces the linear find-job-by-name loops in the tests below;
+    under Hypothesis's repetition count even small scans add up.
+    """
+    return {job['job_name']: job
+            for job in config_dict.get('scrape_configs', [])}
+
+
+domain_strategy = st.builds(
+    lambda label, tld: f'{label}.{tld}',
+    st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789',
+            min_size=1, max_size=20),
+    st.sampled_from(('com', 'org', 'net', 'io', 'app')))
+
+port_strategy = st.integers(min_value=1024, max_value=65535)
+
+metrics_path_strategy = st.builds(
+    lambda name: f'/{name}',
+    st.text(alphabet='abcdefghijklmnopqrstuvwxyz', min_size=1, max_size=20))
+
+
+@given(domain_strategy, port_strategy)
+@example(domain='a' * 63 + '.io', port=1024)
+@example(domain='A.B-C', port=65535)
+@_FAST_SETTINGS
+def test_prometheus_scrape_target_configuration(domain, port):
+    _, config_dict = add_prometheus_scrape_target(_INITIAL_CONFIG_DICT, domain,
+                                                  port, '/metrics')
+    username = sanitize_domain(domain)
+    assert _VALID_USERNAME_RE.match(username)
+    app_job = index_jobs(config_dict).get(username)
+    assert app_job is not None, f"no job for domain {domain!r}"
+    assert app_job['static_configs'][0]['targets'] == [f'localhost:{port}']
+    assert app_job['static_configs'][0]['labels']['domain'] == domain
+    assert app_job['static_configs'][0]['labels']['app'] == username
+
+
+@given(domain_strategy, port_strategy, metrics_path_strategy)
+@example(domain='a.io', port=9090, metrics_path='/metrics')
+@_FAST_SETTINGS
+def test_custom_metrics_endpoint_configuration(domain, port, metrics_path):
+    _, config_dict = add_prometheus_scrape_target(_INITIAL_CONFIG_DICT, domain,
+                                                  port, metrics_path)
+    username = sanitize_domain(domain)
+    app_job = index_jobs(config_dict).get(username)
+    assert app_job is not None
+    assert app_job['metrics_path'] == metrics_path
+
+
+@given(st.lists(st.tuples(domain_strategy, port_strategy),
+                min_size=1, max_size=5, unique_by=lambda app: app[0]))
+@example(apps=[('a.io', 1024), ('b.io', 65535)])
+@_FAST_SETTINGS
+def test_prometheus_preserves_existing_targets(apps):
+    config_yaml, config = add_prometheus_scrape_targets(
+        _INITIAL_CONFIG_DICT, [(domain, port, '/metrics')
+                               for domain, port in apps])
+    # The self-scrape job survives the update.
+    assert any(job['job_name'] == 'prometheus'
+               for job in config['scrape_configs'])
+    job_names = [job['job_name'] for job in get_scrape_targets(config_yaml)]
+    for domain, _ in apps:
+        assert sanitize_domain(domain) in job_names
+
+
+@given(domain_strategy, port_strategy)
+@example(domain='a' * 26 + '.io', port=1024)  # stem truncation boundary
+@_FAST_SETTINGS
+def test_adding_same_application_twice_is_idempotent(domain, port):
+    once_yaml, once = add_prometheus_scrape_target(_INITIAL_CONFIG_DICT,
+                                                   domain, port, '/metrics')
+    twice_yaml, twice = add_prometheus_scrape_target(once, domain, port,
+                                                     '/metrics')
+    assert once == twice
+    assert once_yaml == twice_yaml
+
+
+if __name__ == '__main__':
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, '-v']))
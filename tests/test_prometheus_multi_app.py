@@ -0,0 +1,108 @@
+"""Property-based tests for Prometheus with multiple applications.
+
+The single-app invariants live in test_prometheus_config.py; this
+module reuses its helpers and checks what happens as applications
+accumulate: every app ends up monitored and adding one never disturbs
+the jobs that were already there.
+"""
+
+from hypothesis import Phase, example, given, settings
+from hypothesis import strategies as st
+
+from test_prometheus_config import (_INITIAL_CONFIG_DICT,
+                                    add_prometheus_scrape_target,
+                                    add_prometheus_scrape_targets,
+                                    get_scrape_targets, index_jobs,
+                                    sanitize_domain)
+
+@st.composite
+def _domains(draw):
+    # Same shape as ^[a-z0-9][a-z0-9-]{0,61}[a-z0-9]?\.[a-z]{2,}$ but
+    # drawn from primitive combinators; the regex-to-strategy solver
+    # is far more expensive per draw and this runs for every element
+    # of every generated app list.
+    first = draw(st.sampled_from('abcdefghijklmnopqrstuvwxyz0123456789'))
+    mid = draw(st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789-',
+                       max_size=61))
+    tld = draw(st.text(alphabet='abcdefghijklmnopqrstuvwxyz',
+                       min_size=2, max_size=8))
+    return f'{first}{mid}.{tld}'
+
+
+domain_strategy = _domains()
+
+_FAST_SETTINGS = settings(max_examples=25, deadline=None, database=None,
+                          phases=(Phase.explicit, Phase.reuse,
+                                  Phase.generate))
+
+def _job_signature(job):
+    # .get: the baseline 'prometheus' self-scrape job has no
+    # metrics_path key.
+    return (job.get('metrics_path'),
+            tuple(job['static_configs'][0]['targets']))
+
+
+app_strategy = st.tuples(
+    domain_strategy,
+    st.integers(min_value=9000, max_value=9999),
+    st.sampled_from(('/metrics', '/stats', '/prometheus')))
+
+
+@given(st.lists(app_strategy, min_size=2, max_size=6,
+                unique_by=lambda app: app[0]))
+@example(apps=[('a.io', 9000, '/metrics'), ('b.io', 9999, '/stats')])
+@_FAST_SETTINGS
+def test_multiple_applications_all_monitored(apps):
+    config_yaml, _ = add_prometheus_scrape_targets(_INITIAL_CONFIG_DICT, apps)
+    job_names = [job['job_name'] for job in get_scrape_targets(config_yaml)]
+    for domain, _, _ in apps:
+        assert sanitize_domain(domain) in job_names, \
+            f"domain {domain!r} lost its scrape job"
+
+
+@given(st.lists(app_strategy, min_size=2, max_size=6,
+                unique_by=lambda app: app[0]))
+@example(apps=[('a.io', 9000, '/metrics'), ('b.io', 9999, '/stats')])
+@_FAST_SETTINGS
+def test_adding_application_does_not_modify_existing_targets(apps):
+    *existing, (new_domain, new_port, new_path) = apps
+    config = _INITIAL_CONFIG_DICT
+    for domain, port, metrics_path in existing:
+        _, config = add_prometheus_scrape_target(config, domain, port,
+                                                 metrics_path)
+    # Snapshot only the fields an add could clobber -- metrics_path
+    # and targets -- as flat tuples. Tuple equality beats the nested
+    # dict deep-equality a job.copy() comparison would walk N times
+    # per example.
+    existing_sigs = {job['job_name']: _job_signature(job)
+                     for job in config['scrape_configs']}
+
+    _, updated_dict = add_prometheus_scrape_target(config, new_domain,
+                                                   new_port, new_path)
+    updated_configs = index_jobs(updated_dict)
+    for username, original_sig in existing_sigs.items():
+        assert _job_signature(updated_configs[username]) == original_sig, \
+            f"job {username!r} was modified by an unrelated add"
+
+
+@given(app_strategy)
+@example(app=('a.io', 9000, '/metrics'))
+@_FAST_SETTINGS
+def test_re_adding_application_changes_nothing(app):
+    domain, port, metrics_path = app
+    config_yaml, config = add_prometheus_scrape_target(_INITIAL_CONFIG_DICT,
+                                                       domain, port,
+                                                       metrics_path)
+    again_yaml, _ = add_prometheus_scrape_target(config, domain, port,
+                                                 metrics_path)
+    jobs_before = {job['job_name'] for job in get_scrape_targets(config_yaml)}
+    jobs_after = {job['job_name'] for job in get_scrape_targets(again_yaml)}
+    assert jobs_before == jobs_after
+
+
+if __name__ == '__main__':
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, '-v']))
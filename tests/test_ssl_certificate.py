@@ -0,0 +1,81 @@
+"""Property-based tests for per-domain SSL certificate layout.
+
+setup-ssl.sh obtains one Let's Encrypt certificate per domain under
+/etc/letsencrypt/live/<domain>/. The invariants fuzzed here: every
+domain resolves to its own certificate directory, and the fullchain /
+privkey paths always land under that directory.
+"""
+
+from hypothesis import Phase, example, given, settings
+from hypothesis import strategies as st
+
+_FAST_SETTINGS = settings(max_examples=25, deadline=None, database=None,
+                          phases=(Phase.explicit, Phase.reuse,
+                                  Phase.generate))
+
+_LIVE_PREFIX = '/etc/letsencrypt/live/'
+_LIVE_LEN = len(_LIVE_PREFIX)
+
+
+def get_certificate_path(domain):
+    return f'/etc/letsencrypt/live/{domain}'
+
+
+def get_certificate_files(domain):
+    live = get_certificate_path(domain)
+    return f'{live}/fullchain.pem', f'{live}/privkey.pem'
+
+
+def check_certificate_isolation(domains):
+    """True when every domain gets its own certificate directory.
+
+    The path is /etc/letsencrypt/live/<domain>, so path uniqueness is
+    domain uniqueness -- hash the domains directly and early-exit on
+    the first duplicate instead of building the path list up front.
+    """
+    seen = set()
+    return not any(d in seen or seen.add(d) for d in domains)
+
+
+domain_strategy = st.builds(
+    lambda label, tld: f'{label}.{tld}',
+    st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789',
+            min_size=1, max_size=20),
+    st.sampled_from(('com', 'org', 'net', 'io', 'app')))
+
+
+@given(st.lists(domain_strategy, min_size=2, max_size=10, unique=True))
+@example(domains=['a.io', 'a.com'])
+@_FAST_SETTINGS
+def test_each_domain_has_unique_certificate_path(domains):
+    # Unique domains imply unique certificate paths (the path embeds
+    # the domain verbatim), so compare the domains themselves.
+    assert len(domains) == len(set(domains))
+    assert check_certificate_isolation(domains)
+
+
+@given(st.lists(domain_strategy, min_size=2, max_size=10, unique=True))
+@example(domains=['a.io', 'b.io'])
+@_FAST_SETTINGS
+def test_duplicate_domain_fails_isolation_check(domains):
+    assert not check_certificate_isolation(domains + [domains[0]])
+
+
+@given(domain_strategy)
+@example(domain='a.io')
+@_FAST_SETTINGS
+def test_certificate_files_live_under_domain_directory(domain):
+    cert_path = get_certificate_path(domain)
+    assert cert_path[:_LIVE_LEN] == _LIVE_PREFIX
+    assert cert_path[_LIVE_LEN:] == domain
+    fullchain, privkey = get_certificate_files(domain)
+    assert fullchain == f'{cert_path}/fullchain.pem'
+    assert privkey == f'{cert_path}/privkey.pem'
+
+
+if __name__ == '__main__':
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, '-v']))
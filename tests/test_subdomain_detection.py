@@ -0,0 +1,93 @@
+"""Property-based tests for subdomain detection.
+
+setup-application.sh and setup-ssl.sh count the dots in DOMAIN_NAME
+(tr -cd '.' | wc -c) and treat more than one dot as a subdomain, which
+decides nginx www-redirects and certbot SAN handling. The counting is
+reimplemented here and fuzzed in-process; one batched canary run keeps
+the bash pipeline itself honest.
+"""
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+_KNOWN_CASES = [
+    ('example.com', 1, False),
+    ('api.example.com', 2, True),
+    ('dev.api.example.com', 3, True),
+    ('myapp.io', 1, False),
+]
+
+
+def count_dots(domain):
+    return domain.count('.')
+
+
+def is_subdomain(domain):
+    """More than one dot means subdomain, same rule as the scripts."""
+    return domain.count('.') > 1
+
+
+_label = st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789',
+                 min_size=1, max_size=15)
+_tld = st.sampled_from(('com', 'org', 'net', 'io', 'app'))
+
+root_domain_strategy = st.builds(lambda label, tld: f'{label}.{tld}',
+                                 _label, _tld)
+
+subdomain_strategy = st.builds(
+    lambda subs, label, tld: '.'.join(subs + [label, tld]),
+    st.lists(_label, min_size=1, max_size=3), _label, _tld)
+
+
+# The dot counts are asserted inline via C-level str.count; the
+# parametrized known-case test below keeps count_dots/is_subdomain
+# themselves covered.
+@given(root_domain_strategy)
+@settings(max_examples=100)
+def test_root_domain_is_not_subdomain(domain):
+    assert domain.count('.') == 1
+    assert not is_subdomain(domain)
+
+
+@given(subdomain_strategy)
+@settings(max_examples=100)
+def test_dotted_prefix_is_subdomain(domain):
+    assert domain.count('.') > 1
+    assert is_subdomain(domain)
+
+
+# Parametrized so every case reports independently and pytest-xdist
+# can spread them across workers.
+@pytest.mark.parametrize('domain, dots, expected', _KNOWN_CASES)
+def test_known_domains_classified(domain, dots, expected):
+    assert count_dots(domain) == dots
+    assert is_subdomain(domain) is expected
+
+
+def test_bash_script_subdomain_detection():
+    # Deferred import: only this canary needs subprocess, so module
+    # import and collection (e.g. pytest -k "not bash") skip loading
+    # it; sys.modules makes repeat calls free.
+    import subprocess
+
+    # One bash invocation covering every known case; forking a subshell
+    # (plus tr and wc) per domain would cost milliseconds each for what
+    # is a single str.count in-process.
+    # check_output and bytes all the way down: int() accepts bytes
+    # with surrounding whitespace, so no decode or strip is needed for
+    # wc's numeric output.
+    script = '; '.join(
+        f'echo "{domain}" | tr -cd "." | wc -c'
+        for domain, _, _ in _KNOWN_CASES)
+    raw = subprocess.check_output(['bash', '-c', script])
+    counts = [int(line) for line in raw.split()]
+    assert counts == [dots for _, dots, _ in _KNOWN_CASES]
+
+
+if __name__ == '__main__':
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,184 @@
+"""Property-based tests for the per-application systemd unit.
+
+setup-application.sh writes /etc/systemd/system/app-<username>.service
+from a heredoc. The reference implementation here renders the same
+unit so its invariants can be fuzzed: the service runs as the
+unprivileged per-app user, restarts on failure, and carries the
+resource limits and security settings from the template.
+"""
+
+import re
+from functools import lru_cache
+
+from hypothesis import Phase, given, settings
+from hypothesis import strategies as st
+
+# Bound-method pattern call skips the re module cache lookup on every
+# example; the pattern runs hundreds of times per session.
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+
+_SERVICE_HEADER = '[Service]'
+_SERVICE_HEADER_LEN = len(_SERVICE_HEADER)
+
+
+def _service_section(content):
+    """Slice out the [Service] block (up to the next section header).
+
+    The template is fixed, so two str.find scans beat running the
+    regex engine over the unit for every example.
+    """
+    start = content.find(_SERVICE_HEADER)
+    assert start >= 0, 'no [Service] section'
+    start += _SERVICE_HEADER_LEN
+    end = content.find('[', start)
+    assert end > start, 'unterminated [Service] section'
+    return content[start:end]
+
+
+@lru_cache(maxsize=4096)
+def sanitize_domain(domain):
+    """Domain -> Linux username, mirroring the sed/cut pipeline in
+    infra/scripts/setup-application.sh.
+
+    Pure string -> string, so caching is safe; the shrinker retries
+    near-identical domains constantly.
+    """
+    return _NON_ALNUM_RE.sub('', domain.lower())[:32]
+
+
+# The template stays here in readable form; at import it is split on
+# its placeholders into constant fragments so rendering is one join of
+# pre-interned strings instead of format_map re-parsing the template
+# per call. Slot order: domain, username, user_home, port, user_home.
+_SERVICE_TEMPLATE = """\
+[Unit]
+Description=Application for {domain}
+After=network.target
+
+[Service]
+Type=simple
+User={username}
+WorkingDirectory={user_home}/app
+Environment="APP_PORT={port}"
+ExecStart={user_home}/app/start.sh
+Restart=always
+RestartSec=10
+StandardOutput=journal
+StandardError=journal
+
+# Resource limits for high concurrency
+LimitNOFILE=65535
+LimitNPROC=4096
+
+# Security settings
+NoNewPrivileges=true
+PrivateTmp=true
+
+[Install]
+WantedBy=multi-user.target
+"""
+
+_F0, _F1, _F2, _F3, _F4, _F5 = re.split(
+    r'\{(?:domain|username|user_home|port)\}', _SERVICE_TEMPLATE)
+
+
+@lru_cache(maxsize=8192)
+def generate_systemd_service(domain, username, port):
+    """Render the unit for an application; returns (service_name, content).
+
+    Pure function of hashable arguments, so the lru_cache is safe;
+    Hypothesis re-draws the same small values constantly.
+    """
+    user_home = f'/home/{username}'
+    content = ''.join((_F0, domain, _F1, username, _F2, user_home,
+                       _F3, str(port), _F4, user_home, _F5))
+    return f'app-{username}', content
+
+
+# Required-line sets built once at import; each test splits the
+# rendered unit once and does O(1) set lookups instead of repeated
+# substring scans over the whole content per assertion.
+_RESTART_LINES = frozenset({'Restart=always', 'RestartSec=10'})
+_LIMIT_LINES = frozenset({'LimitNOFILE=65535', 'LimitNPROC=4096'})
+_SECURITY_LINES = frozenset({'NoNewPrivileges=true', 'PrivateTmp=true'})
+_REQUIRED_LINES = _RESTART_LINES | _LIMIT_LINES | _SECURITY_LINES
+
+# All section headers in one regex pass plus one subset check, rather
+# than a linear scan of the unit per required section.
+_REQUIRED_SECTIONS = frozenset({'[Unit]', '[Service]', '[Install]'})
+_SECTION_RE = re.compile(r'^\[[^\]]+\]$', re.M)
+
+
+def _assert_service_lines(content, required):
+    missing = required - frozenset(content.splitlines())
+    assert not missing, f'missing unit lines: {sorted(missing)}'
+
+
+username_strategy = st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789',
+                            min_size=1, max_size=32)
+
+port_strategy = st.integers(min_value=9000, max_value=9999)
+
+
+@st.composite
+def _service_case(draw):
+    # Derive the domain and render the unit inside the strategy, so
+    # each example carries its pre-built case and the property body
+    # does no repeated derivation.
+    username = draw(username_strategy)
+    port = draw(port_strategy)
+    name, content = generate_systemd_service(f'{username}.com', username,
+                                             port)
+    return username, port, name, content
+
+# Trivial pure-string properties over a tiny input space: 25 examples
+# saturate coverage, and the example database, deadline and shrink
+# phase are pure overhead at microsecond-per-example scale.
+_FAST = settings(max_examples=25, deadline=None, database=None,
+                 phases=(Phase.explicit, Phase.reuse, Phase.generate))
+
+
+# One fused property instead of four near-duplicates over the same
+# input space: each example draws once, renders once and checks every
+# invariant, cutting generator and build calls 4x for identical
+# coverage.
+@given(_service_case())
+@_FAST
+def test_systemd_service_all_properties(case):
+    username, _, _, content = case
+    # Runs as the unprivileged per-app user.
+    section = _service_section(content)
+    assert f'User={username}' in frozenset(section.splitlines())
+    assert 'User=root' not in content
+    # Restart policy, resource limits and security settings.
+    _assert_service_lines(content, _REQUIRED_LINES)
+
+
+# A guaranteed leading alnum char means sanitize_domain can never
+# return '' -- no wasted draws and no early-out guard in the test.
+_messy_domain = st.builds(
+    lambda first, rest: first + rest,
+    st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789',
+            min_size=1, max_size=1),
+    st.text(alphabet='abcdefghijklmnopqrstuvwxyz0123456789.-',
+            min_size=2, max_size=49))
+
+
+@given(_messy_domain)
+@_FAST
+def test_systemd_service_file_path_is_correct(domain):
+    username = sanitize_domain(domain)
+    service_name, content = generate_systemd_service(domain, username, 9000)
+    assert service_name == f'app-{username}'
+    service_file = f'/etc/systemd/system/{service_name}.service'
+    assert service_file.startswith('/etc/systemd/system/app-')
+    assert service_file.endswith('.service')
+    assert _REQUIRED_SECTIONS <= frozenset(_SECTION_RE.findall(content))
+
+
+if __name__ == '__main__':
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, '-v']))